@@ -1,13 +1,92 @@
 from __future__ import annotations  # for forward references
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from pathlib import Path
+from functools import cached_property, lru_cache
+from itertools import accumulate, groupby
 import argparse
+import json
 import os
 import re
+import string
+import sys
 
 INDEX_PAGE = 0  # for `00-` index pages
 FLASHCARDS_PAGE = 99  # for `99-` flashcard pages`
 
+# zero-padded `00`-`99` page/section numbers, see `_two_digit()`
+_TWO_DIGIT = tuple(f"{i:02d}" for i in range(100))
+
+# single-character substitutions applied by `generate_slug()`, `None` deletes the character
+_SLUG_TABLE = str.maketrans(
+    {
+        " ": "_",
+        "/": "-",
+        "(": None,
+        ")": None,
+        "?": None,
+        "!": None,
+        ",": None,
+        "'": None,
+    }
+)
+
+# pre-encoded page template fragments for `render_page_chunks()`: the page head is
+# YAML_OPEN + title + (YAML_DATES | YAML_NODATES) + title + TOC, and TAIL precedes the `extra`
+_TPL_YAML_OPEN = b'---\ntitle: "'
+_TPL_YAML_DATES = b'"\ntags: []\ndates: []\n---\n# '
+_TPL_YAML_NODATES = b'"\ntags: []\n---\n# '
+_TPL_TOC = b"\n## TOC\n"
+_TPL_TAIL = b"\n---\n"
+
+
+# splits a title on whitespace, keeping the whitespace runs, for `handle_title()`
+_SPLIT_RE = re.compile(r"(\s+)")
+
+# matches a single valid Roman numeral, e.g. `ii`, `IX`, `xiv`
+_ROM_REGEX = re.compile(
+    r"^((?=[MDCLXVI])M*(C[MD]|D?C{0,3})(X[CL]|L?X{0,3})(I[XV]|V?I{0,3}))$",
+    re.IGNORECASE,
+)
+
+# words left lower-case by `handle_title()` unless they are the first word
+_LOWER_CASE_WORDS = frozenset(
+    {
+        "a",
+        "an",
+        "the",
+        "and",
+        "but",
+        "or",
+        "nor",
+        "for",
+        "so",
+        "yet",
+        "as",
+        "at",
+        "by",
+        "down",
+        "from",
+        "in",
+        "into",
+        "like",
+        "near",
+        "of",
+        "off",
+        "on",
+        "onto",
+        "out",
+        "over",
+        "past",
+        "per",
+        "to",
+        "up",
+        "upon",
+        "with",
+        "via",
+        "vs",
+    }
+)
+
 
 class FileGenerator:
     """
@@ -17,26 +96,131 @@ class FileGenerator:
     """
 
     @classmethod
-    def create_markdown_file(cls, markdown_page: MarkdownPage, out_dir: str) -> None:
+    def create_markdown_file(
+        cls,
+        markdown_page: MarkdownPage,
+        out_dir: str,
+        pending: list[tuple[str, tuple[bytes | memoryview, ...]]] | None = None,
+    ) -> None:
         """
         Create a Markdown file on disk using the `MarkdownPage` `template`.
 
-        This method creates a path and any necessary directories, and writes the `template` to the file.
+        This method creates a path and any necessary directories, and writes the `template` to the file. If a `pending` list is supplied, the file is queued on it for `write_files()` instead.
 
         Args:
             markdown_page (MarkdownPage):
                 An object whose `.filename` is the desired filename, and the `.template` is the markdown-formatted page template to write to the file.
             out_dir (str):
                 The directory path where the file will be created.
+            pending (list[tuple[str, tuple[bytes | memoryview, ...]]] | None):
+                If supplied, the `(file_path, chunks)` pair is appended here rather than written immediately.
         """
-        file_path: str = out_dir + "/" + markdown_page.filename
-        output_file: Path = Path(file_path)
-        output_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(output_file, "w") as file:
-            file.write(markdown_page.template)
+        file_path: str = os.path.join(out_dir, markdown_page.filename)
+        chunks: tuple[bytes | memoryview, ...] = markdown_page.template
+        if pending is not None:
+            pending.append((file_path, chunks))
+            return
 
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        cls.write_file(file_path, chunks)
+
+    @classmethod
+    def write_files(
+        cls,
+        pending: list[tuple[str, tuple[bytes | memoryview, ...]]],
+        created_dirs: set[str] | None = None,
+    ) -> None:
+        """
+        Writes every queued file in one pass, grouped by directory so each parent directory is created only once. The directories are then written concurrently on a thread pool, as the file system calls release the GIL.
+
+        Args:
+            pending (list[tuple[str, tuple[bytes | memoryview, ...]]]):
+                The `(file_path, chunks)` pairs queued by `create_markdown_file()`.
+            created_dirs (set[str] | None):
+                The directories already created during this run, shared with `_ensure_dir()`; a new set is used if not supplied.
+        """
+        if created_dirs is None:
+            created_dirs = set()
+
+        pending.sort(key=lambda item: os.path.split(item[0]))
+        groups = [
+            (parent_dir, list(files))
+            for parent_dir, files in groupby(
+                pending, key=lambda item: os.path.dirname(item[0])
+            )
+        ]
+        for parent_dir, _ in groups:
+            _ensure_dir(parent_dir, created_dirs)
+
+        if len(groups) <= 1:
+            for parent_dir, files in groups:
+                cls.write_directory(parent_dir, files)
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(32, os.cpu_count() or 4, len(groups))
+        ) as executor:
+            # consume the results so any write error is raised here
+            list(executor.map(lambda group: cls.write_directory(*group), groups))
+
+    @classmethod
+    def write_directory(
+        cls, parent_dir: str, files: list[tuple[str, tuple[bytes | memoryview, ...]]]
+    ) -> None:
+        """
+        Writes the queued `files` that all live in the existing directory `parent_dir`. Where the platform supports it, the directory is opened once and its files are created relative to it, so the kernel doesn't re-resolve the full path for every file.
+
+        Args:
+            parent_dir (str):
+                The directory containing every file in `files`.
+            files (list[tuple[str, tuple[bytes | memoryview, ...]]]):
+                The `(file_path, chunks)` pairs to write.
+        """
+        if os.open not in os.supports_dir_fd:
+            for file_path, chunks in files:
+                cls.write_file(file_path, chunks)
+            return
+
+        dir_fd = os.open(parent_dir, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+        try:
+            for file_path, chunks in files:
+                cls.write_file(os.path.basename(file_path), chunks, dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @classmethod
+    def write_file(
+        cls,
+        file_path: str,
+        chunks: tuple[bytes | memoryview, ...],
+        dir_fd: int | None = None,
+    ) -> None:
+        """
+        Writes the `chunks` to `file_path` with the low-level file descriptor API, avoiding the buffered text-mode wrapper. Where available, all chunks go out in a single gathered `writev()` call without being joined first.
 
-@dataclass
+        Args:
+            file_path (str):
+                The path of the file to create or overwrite.
+            chunks (tuple[bytes | memoryview, ...]):
+                The encoded file contents, in order.
+            dir_fd (int | None):
+                An open directory descriptor that `file_path` is relative to, if any.
+        """
+        fd = os.open(
+            file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644, dir_fd=dir_fd
+        )
+        try:
+            written = os.writev(fd, chunks) if hasattr(os, "writev") else 0
+            if written < sum(map(len, chunks)):
+                # finish off a short (or unsupported) gathered write
+                view = memoryview(b"".join(chunks))[written:]
+                while view:
+                    view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+
+
+@dataclass(slots=True)
 class MarkdownPage:
     """
     A single markdown document page.
@@ -46,15 +230,15 @@ class MarkdownPage:
             The page title (used in H1 and in YAML).
         slug (str):
             A slugified `title`, used for directory names and Obsidian links.
-        template (str):
-            The markdown text that will make up the file.
+        template (tuple[bytes | memoryview, ...]):
+            The UTF-8 encoded chunks of markdown text that make up the file, in order.
         filename (str):
             The name of the file, e.g. `00-index.md`.
     """
 
     title: str
     slug: str
-    template: str
+    template: tuple[bytes | memoryview, ...]
     filename: str
 
 
@@ -73,18 +257,24 @@ class Section:
             The Course object.
         index (int):
             Numeric position of the section within the course, to generate the filename and TOC.
-        section_toc (str):
-            A string representing the section index TOC in markdown format.
+        section_toc (tuple[bytes | memoryview, ...]):
+            The UTF-8 encoded chunks of the section TOC, which are views into the listing shared by the whole course rather than a copy of it.
 
     Methods:
-        section_template() -> str:
+        title_cased() -> str:
+            Returns the `section_title` converted by `handle_title()`, computed once per section.
+        subsection_slugs() -> list[str]:
+            Returns the slug of each of the `subsections`, computed once per section.
+        subsection_titles_cased() -> list[str]:
+            Returns each of the `subsections` converted by `handle_title()`, computed once per section.
+        section_template() -> tuple[bytes | memoryview, ...]:
             Returns the completed markdown string (YAML, TOC, etc.) for the section's index page (`00-section_name.md`).
-        flashcard_template() -> str:
+        flashcard_template() -> tuple[bytes | memoryview, ...]:
             Returns the completed markdown string (YAML, TOC, etc.) for the section's flashcard page (`99-flashcards_section_name.md`).
         add_subsections(subsection_title: str) -> None:
             Appends a new `subsection_title` to the list of `subsections`.
-        generate_section_toc(all_sections: list[Section], course: Course) -> str:
-            Generates the markdown for an Obsidian-formatted table of contents, where the subsections are indented under their parent section link.
+        generate_section_toc(course: Course, index: int, write_dirs: bool, no_toc: bool) -> tuple[bytes | memoryview, ...]:
+            Assembles the UTF-8 encoded chunks of an Obsidian-formatted table of contents from the course's precomputed TOC listing, where the subsections are indented under their parent section link.
         generate_dir_and_markdown_files(self, index: int, course: Course) -> None:
             Creates the TOC, all directories, and all markdown pages.
     """
@@ -94,50 +284,76 @@ class Section:
     subsections: list[str]
     course: Course
     index: int
-    section_toc: str
+    section_toc: tuple[bytes | memoryview, ...]
 
     def __init__(self, section_title: str, course: Course) -> None:
-        self.slug = generate_slug(section_title)
+        # interned, as the slug is embedded in every table of contents
+        self.slug = sys.intern(generate_slug(section_title))
         self.section_title = section_title
         self.subsections = []
         self.course = course
         self.index = 0
-        self.section_toc = ""
+        self.section_toc = ()
 
-    @property
-    def section_template(self) -> str:
+    @cached_property
+    def title_cased(self) -> str:
         """
-        Generates a title and passes it to the `render_markdown()` function to create the `section_template` markdown text on the fly.
+        The `section_title` converted to title case by `handle_title()`, cached so the TOCs and page titles don't re-run it.
 
         Returns:
-            str: Markdown-formatted text for the section index page.
+            str: The title-cased `section_title`.
         """
-        sec_num = f"{self.index:02d}"
+        return sys.intern(handle_title(self.section_title))
 
-        sec_title = f"{self.course.short_title} - {sec_num}.{INDEX_PAGE:02d} - {handle_title(self.section_title)}"
-        return render_markdown(sec_title, self.section_toc)
+    @cached_property
+    def subsection_slugs(self) -> list[str]:
+        """
+        The slug of each of the `subsections`, cached for the TOCs and filenames.
 
-    @property
-    def flashcard_template(self) -> str:
+        Returns:
+            list[str]: The slugified `subsections`, in order.
+        """
+        return [generate_slug(subsection) for subsection in self.subsections]
+
+    @cached_property
+    def subsection_titles_cased(self) -> list[str]:
         """
-        Generates a title and a list of `H2` subsection headers (as the `extra` argument) and passes to `render_markdown()` to create the `flashcard_template` markdown on the fly.
+        Each of the `subsections` converted to title case by `handle_title()`, cached for the TOCs and page titles.
 
         Returns:
-            str: Markdown-formatted text for the section flashcard page, including subsection `H2` headers for each subsection.
+            list[str]: The title-cased `subsections`, in order.
         """
-        sec_num = f"{self.index:02d}"
+        return [handle_title(subsection) for subsection in self.subsections]
 
-        flashcards_title = f"{self.course.short_title} - {sec_num}.{FLASHCARDS_PAGE} - {handle_title(self.section_title)} Flashcards"
+    def section_template(self) -> tuple[bytes | memoryview, ...]:
+        """
+        Generates a title and passes it to the `render_page_chunks()` function to create the `section_template` markdown text (so `index` and `section_toc` must already be set).
 
-        sub_sections = []
+        Returns:
+            tuple[bytes | memoryview, ...]: UTF-8 encoded chunks of markdown-formatted text for the section index page.
+        """
+        sec_num = _two_digit(self.index)
 
-        # Adds each subsection as a header in the flashcard file
-        for sub_section in self.subsections:
-            sub_sections.append(f"## {handle_title(sub_section)}\n" "\n" "\n")
+        sec_title = f"{self.course.short_title} - {sec_num}.{_two_digit(INDEX_PAGE)} - {self.title_cased}"
+        return render_page_chunks(sec_title, self.section_toc)
 
-        sub_section_lines = "".join(sub_sections)
+    def flashcard_template(self) -> tuple[bytes | memoryview, ...]:
+        """
+        Generates a title and a list of `H2` subsection headers (as the `extra` argument) and passes to `render_page_chunks()` to create the `flashcard_template` markdown (so `index` and `section_toc` must already be set).
 
-        return render_markdown(
+        Returns:
+            tuple[bytes | memoryview, ...]: UTF-8 encoded chunks of markdown-formatted text for the section flashcard page, including subsection `H2` headers for each subsection.
+        """
+        sec_num = _two_digit(self.index)
+
+        flashcards_title = f"{self.course.short_title} - {sec_num}.{_two_digit(FLASHCARDS_PAGE)} - {self.title_cased} Flashcards"
+
+        # Adds each subsection as a header in the flashcard file
+        sub_section_lines = "".join(
+            f"## {sub_title}\n\n\n" for sub_title in self.subsection_titles_cased
+        )
+
+        return render_page_chunks(
             flashcards_title, self.section_toc, extra=sub_section_lines, dates=False
         )
 
@@ -149,68 +365,47 @@ class Section:
             subsection_title (str): The title of the subsection.
         """
         self.subsections.append(subsection_title)
+        # drop any cached per-subsection values, they no longer cover every subsection
+        self.__dict__.pop("subsection_slugs", None)
+        self.__dict__.pop("subsection_titles_cased", None)
 
     def generate_section_toc(
         self,
-        all_sections: list[Section],
         course: Course,
+        index: int,
         write_dirs: bool,
         no_toc: bool,
-    ) -> str:
+    ) -> tuple[bytes | memoryview, ...]:
         """
-        Loops through the sections, creating the Obsidian-formatted markdown links for each `section`. The `subsections` of the current `section` are also generated and indented.
+        Splits the TOC listing encoded once by `Course.precompute_toc_lines()` around the indented `subsections` of the current `section`, so every page of every `section` writes from the same listing rather than its own copy.
 
         Args:
-            all_sections (list[Section]):
-                The list of all sections from the instantiated `Course` object.
             course (Course):
-                A reference to the current `Course` object.
+                A reference to the current `Course` object, holding the precomputed TOC lines.
+            index (int):
+                The (1-based) position of this `section` within the `course`.
 
         Returns:
-            str: A section table of contents, containing each `section` and only the `subsections` of the current `section`, which are indented.
-        """
-        lines = [
-            f"- [[{INDEX_PAGE:02d}-{course.slug}|{course.short_title} - {handle_title(course.course_title)}]]\n"
-        ]
-        for sec_idx, section in enumerate(all_sections, start=1):
-            slug = generate_slug(section.section_title)
-            num = f"{sec_idx:02d}"
-
-            if write_dirs:
-                # Adds a link for each section
-                lines.append(
-                    f"- [[{INDEX_PAGE:02d}-{slug}|"
-                    f"{course.short_title} - {num}.{INDEX_PAGE:02d} "
-                    f"- {handle_title(section.section_title)}]]\n"
-                )
-                # Adds and indents all subsections of current section
-                if section is self:
-                    for sub_idx, subsection in enumerate(self.subsections, start=1):
-                        sub_slug = generate_slug(subsection)
-                        sec_num = f"{sec_idx:02d}"
-                        sub_num = f"{sub_idx:02d}"
-                        lines.append(
-                            f"\t- [[{sub_num}-{sub_slug}|"
-                            f"{course.short_title} - {sec_num}.{sub_num} - {handle_title(subsection)}]]\n"
-                        )
+            tuple[bytes | memoryview, ...]: The UTF-8 encoded chunks of the section table of contents, in order.
 
-                    section_flashcard_file = (
-                        f"\t- [[{FLASHCARDS_PAGE}-flashcards_{slug}|"
-                        f"{course.short_title} - {num}.{FLASHCARDS_PAGE} "
-                        f"- {handle_title(self.section_title)} Flashcards]]\n"
-                    )
-                    lines.append(section_flashcard_file)
+        Raises:
+            ValueError: If `index` is not the position of a `section` in the precomputed TOC lines.
+        """
+        if not 1 <= index <= len(course.toc_subsection_blocks):
+            raise ValueError(
+                f"Section index {index} is out of range for {len(course.toc_subsection_blocks)} sections."
+            )
+        listing = memoryview(course.toc_listing)
+        if not write_dirs and no_toc:
+            # only the link to the course index page
+            return (listing[: course.toc_line_ends[0]],)
 
-            else:
-                if not no_toc:
-                    # Adds a link for each section
-                    lines.append(
-                        f"- [[{sec_idx:02d}-{slug}|"
-                        f"{course.short_title} - {sec_idx:02d} "
-                        f"- {handle_title(section.section_title)}]]\n"
-                    )
+        subsection_block = course.toc_subsection_blocks[index - 1]
+        if not subsection_block:
+            return (course.toc_listing,)
 
-        return "".join(lines)
+        split = course.toc_line_ends[index]
+        return (listing[:split], subsection_block, listing[split:])
 
     def generate_dir_and_markdown_files(
         self,
@@ -219,10 +414,12 @@ class Section:
         write_dirs: bool,
         extra_section: str,
         no_toc: bool,
+        pending: list[tuple[str, tuple[bytes | memoryview, ...]]] | None = None,
+        created_dirs: set[str] | None = None,
     ) -> None:
         """
         - Creates the TOC for the `section`, and the `outdir` for the course and `section`.
-        - Instantiates MarkdownPage objects for the `course` index, `section` index and flashcard files and runs the `FileGenerator` function to write the files.
+        - Instantiates MarkdownPage objects for the `section` index and flashcard files and runs the `FileGenerator` function to write the files.
         - Loops over the list of `subsections` to instantiate MarkdownPage objects and runs `FileGenerator` function to write the files for each `subsection`.
 
         Args:
@@ -230,47 +427,53 @@ class Section:
                 The `index` of the current section, used to generate the appropriate directory and links.
             course (Course):
                 A reference to the current `Course` instantiation.
+            pending (list[tuple[str, tuple[bytes | memoryview, ...]]] | None):
+                If supplied, the files are queued here for `FileGenerator.write_files()` rather than written immediately.
+            created_dirs (set[str] | None):
+                The directories already created during this run, shared with `_ensure_dir()`.
         """
         self.index = index  # store section index on the fly
 
-        self.section_toc: str = self.generate_section_toc(
-            course.sections, course, write_dirs, no_toc
+        self.section_toc = self.generate_section_toc(
+            course, index, write_dirs, no_toc
         )
 
         if write_dirs:
+            sec_num = _two_digit(index)
+            outdir = os.path.join(course.output_dir, f"{sec_num}-{self.slug}")
+            review_dir = os.path.join(outdir, "100-review_files")
             # make review dir
-            os.makedirs(f"{course.output_dir}/{index:02d}-{self.slug}/100-review_files/", exist_ok=True)
-            outdir = f"{course.output_dir}/{index:02d}-{self.slug}"
+            _ensure_dir(review_dir, created_dirs)
 
             section_index_file: MarkdownPage = MarkdownPage(
                 self.section_title,
                 self.slug,
-                self.section_template,
-                f"{INDEX_PAGE:02d}-" + self.slug + ".md",
+                self.section_template(),
+                f"{_two_digit(INDEX_PAGE)}-{self.slug}.md",
             )
 
             section_flashcard_file: MarkdownPage = MarkdownPage(
                 f"{self.section_title} Flashcards",
                 self.slug,
-                self.flashcard_template,
-                f"{FLASHCARDS_PAGE}-flashcards_{self.slug}.md",
-            )
-
-            course_index_file: MarkdownPage = MarkdownPage(
-                course.course_title,
-                course.slug,
-                course.course_template,
-                f"{INDEX_PAGE:02d}-" + course.slug + ".md",
+                self.flashcard_template(),
+                f"{_two_digit(FLASHCARDS_PAGE)}-flashcards_{self.slug}.md",
             )
 
-            FileGenerator.create_markdown_file(section_index_file, outdir)
-            FileGenerator.create_markdown_file(section_flashcard_file, outdir)
-            FileGenerator.create_markdown_file(course_index_file, course.output_dir)
+            FileGenerator.create_markdown_file(section_index_file, outdir, pending)
+            FileGenerator.create_markdown_file(section_flashcard_file, outdir, pending)
 
-            for index, sub_section in enumerate(self.subsections, start=1):
-                sub_num = f"{self.index:02d}.{index:02d}"
+            for index, (sub_section, slug, sub_title_cased) in enumerate(
+                zip(
+                    self.subsections,
+                    self.subsection_slugs,
+                    self.subsection_titles_cased,
+                ),
+                start=1,
+            ):
+                sub_idx = _two_digit(index)
+                sub_num = f"{sec_num}.{sub_idx}"
 
-                sub_title = f"{self.course.short_title} - {sub_num} - {handle_title(sub_section)}"
+                sub_title = f"{self.course.short_title} - {sub_num} - {sub_title_cased}"
 
                 if extra_section:
                     sub_extra_headers = extra_section
@@ -279,46 +482,37 @@ class Section:
                         "# Key Points/Concepts\n\n# Lecture\n\n# Misc."
                     )
 
-                sub_template: str = render_markdown(
+                sub_template: tuple[bytes | memoryview, ...] = render_page_chunks(
                     sub_title, self.section_toc, extra=sub_extra_headers
                 )
 
-                slug: str = generate_slug(sub_section)
-                filename = f"{index:02d}-{slug}.md"
+                filename = f"{sub_idx}-{slug}.md"
                 sub_section_page: MarkdownPage = MarkdownPage(
                     sub_section, slug, sub_template, filename
                 )
-                FileGenerator.create_markdown_file(sub_section_page, outdir)
+                FileGenerator.create_markdown_file(sub_section_page, outdir, pending)
                 # make review dir
-                os.makedirs(f"{outdir}/100-review_files/{index:02d}-{slug}/", exist_ok=True)
+                _ensure_dir(os.path.join(review_dir, f"{sub_idx}-{slug}"), created_dirs)
         else:
-            outdir = f"{course.output_dir}"
-            os.makedirs(f"{course.output_dir}/100-review_files/", exist_ok=True)
-
-            course_index_file: MarkdownPage = MarkdownPage(
-                course.course_title,
-                course.slug,
-                course.course_template,
-                f"{INDEX_PAGE:02d}-" + course.slug + ".md",
-            )
-            FileGenerator.create_markdown_file(course_index_file, course.output_dir)
+            outdir = course.output_dir
+            _ensure_dir(os.path.join(outdir, "100-review_files"), created_dirs)
 
             if extra_section:
                 section_outline = extra_section
             else:
                 section_outline = "# Key Points/Concepts\n\n# Lecture\n\n# Misc."
 
-            section_title = f"{self.course.short_title} - {self.index:02d} - {handle_title(self.section_title)}"
+            section_title = f"{self.course.short_title} - {_two_digit(self.index)} - {self.title_cased}"
             slug = self.slug
-            sub_template: str = render_markdown(
+            sub_template: tuple[bytes | memoryview, ...] = render_page_chunks(
                 section_title, self.section_toc, extra=section_outline
             )
 
-            filename = f"{index:02d}-{slug}.md"
+            filename = f"{_two_digit(index)}-{slug}.md"
             section_markdown_file: MarkdownPage = MarkdownPage(
                 section_title, slug, sub_template, filename
             )
-            FileGenerator.create_markdown_file(section_markdown_file, outdir)
+            FileGenerator.create_markdown_file(section_markdown_file, outdir, pending)
 
 
 class Course:
@@ -334,15 +528,27 @@ class Course:
             The number of the course within a larger specialization or program, prepends the main directory with this as a two-digit number (e.g. `01-course_name/`). If left blank (`None`), no course number is added (e.g. `course_name/`).
         sections (list[Section]):
             A list containing all of the instantiated `Section` objects.
-        course_template (str):
-            The markdown template to be used in the `MarkdownPage` instantiation.
+        course_template (tuple[bytes, ...]):
+            The UTF-8 encoded chunks of the markdown template to be used in the `MarkdownPage` instantiation.
         slug (str):
             A slugified version of the `course_title`.
+        toc_listing (bytes):
+            The TOC line linking to the course index page, followed by one TOC link line per `section`, joined and UTF-8 encoded once per course.
+        toc_line_ends (list[int]):
+            The byte offset into `toc_listing` at which each line ends - first the course index line, then each `section` line, where that section's `subsections` are spliced in.
+        toc_subsection_blocks (list[bytes]):
+            For each `section`, its UTF-8 encoded, indented `subsection` and flashcard TOC lines (empty when not writing directories).
 
     Methods:
-        generate_course_template() -> str:
+        title_cased() -> str:
+            Returns the `course_title` converted by `handle_title()`, computed once per course.
+        generate_course_template() -> tuple[bytes, ...]:
             Generates the markdown for the course template.
+        precompute_toc_lines(write_dirs: bool) -> None:
+            Builds the encoded TOC listing shared by every table of contents.
         output_dir() -> str:
+            Returns the course directory resolved by `generate_course()`.
+        resolve_output_dir() -> str:
             Uses the `slug` and optionally the `course_number` to create the directory name.
         generate_sections(sections: list[Section]) -> None:
             Loops over the list of `Section` objects to create all directories and files.
@@ -354,8 +560,12 @@ class Course:
     short_title: str
     course_number: int | None
     sections: list[Section]
-    course_template: str
+    course_template: tuple[bytes, ...]
     slug: str
+    toc_listing: bytes
+    toc_line_ends: list[int]
+    toc_subsection_blocks: list[bytes]
+    _output_dir: str
 
     def __init__(self, course_title, short_title, course_number=None):
         self.course_title = course_title
@@ -363,70 +573,176 @@ class Course:
         self.course_number = course_number
 
         self.sections = []
-        self.course_template = ""
+        self.course_template = ()
         self.slug = ""
+        self.toc_listing = b""
+        self.toc_line_ends = []
+        self.toc_subsection_blocks = []
+        self._output_dir = ""
 
     def __str__(self):
         return (
             f"***Course Title:\n{self.course_title}\n"
             f"***Short Title:\n{self.short_title}\n"
-            f"***Template:\n{self.course_template}\n"
+            f"***Template:\n{b''.join(self.course_template).decode('utf-8')}\n"
             f"***Folder Name:{self.slug}"
         )
 
-    def generate_course_template(self, write_dirs: bool) -> str:
+    @cached_property
+    def title_cased(self) -> str:
         """
-        Generates the `title` and `table_of_contents` for the `course` index file.
+        The `course_title` converted to title case by `handle_title()`, cached as it appears in every table of contents.
 
         Returns:
-            str: Markdown containing the main course YAML information, headers, and a table of contents with each `section` and all `subsections` (indented under their parent `section`).
+            str: The title-cased `course_title`.
         """
+        return sys.intern(handle_title(self.course_title))
 
-        title = f"{self.short_title} - {handle_title(self.course_title)}"
+    def generate_course_template(self) -> tuple[bytes, ...]:
+        """
+        Generates the `title` and `table_of_contents` for the `course` index file from the TOC lines built by `precompute_toc_lines()`.
 
-        lines = [
-            f"- [[{INDEX_PAGE:02d}-{self.slug}|{self.short_title} - {handle_title(self.course_title)}]]\n"
-        ]
+        Returns:
+            tuple[bytes, ...]: UTF-8 encoded chunks of markdown containing the main course YAML information, headers, and a table of contents with each `section` and all `subsections` (indented under their parent `section`).
+        """
+
+        title = f"{self.short_title} - {self.title_cased}"
+
+        return render_page_chunks(title, (_build_full_toc(self),), dates=False)
+
+    def precompute_toc_lines(self, write_dirs: bool) -> None:
+        """
+        Builds and UTF-8 encodes the TOC lines once per course in a single pass over the `sections`, slugging and title-casing each title only once. Every table of contents - the course index and each `section` - is then assembled from this one `toc_listing` by splicing in `subsections`, rather than re-rendering every other `section`.
 
+        Args:
+            write_dirs (bool):
+                If the sections are written as directories, in which case the `subsections` and flashcard links are also built.
+        """
+        header = "".join(
+            (
+                "- [[",
+                _two_digit(INDEX_PAGE),
+                "-",
+                self.slug,
+                "|",
+                self.short_title,
+                " - ",
+                self.title_cased,
+                "]]\n",
+            )
+        )
+        lines = [header]
+        self.toc_subsection_blocks = []
+
+        index_num = _two_digit(INDEX_PAGE)
+        flashcards_num = _two_digit(FLASHCARDS_PAGE)
+        short_title = self.short_title
+
+        # each link line is joined from its fragments in one allocation
         for sec_idx, section in enumerate(self.sections, start=1):
-            sec_slug: str = generate_slug(section.section_title)
-            sec_num = f"{sec_idx:02d}"
+            sec_num = _two_digit(sec_idx)
 
             if write_dirs:
                 lines.append(
-                    f"- [[{INDEX_PAGE:02d}-{sec_slug}|"
-                    f"{self.short_title} - {sec_num}.{INDEX_PAGE:02d} "
-                    f"- {handle_title(section.section_title)}]]\n"
+                    "".join(
+                        (
+                            "- [[",
+                            index_num,
+                            "-",
+                            section.slug,
+                            "|",
+                            short_title,
+                            " - ",
+                            sec_num,
+                            ".",
+                            index_num,
+                            " - ",
+                            section.title_cased,
+                            "]]\n",
+                        )
+                    )
                 )
-                # indent all subsections
-                for sub_idx, subsection in enumerate(section.subsections, start=1):
-                    sub_slug: str = generate_slug(subsection)
-                    sec_num = f"{sec_idx:02d}"
-                    sub_num = f"{sub_idx:02d}"
-                    lines.append(
-                        f"\t- [[{sub_num}-{sub_slug}|"
-                        f"{self.short_title} - {sec_num}.{sub_num} - {handle_title(subsection)}]]\n"
+                # indent all subsections, followed by the section flashcards
+                block = []
+                for sub_idx, (sub_slug, sub_title) in enumerate(
+                    zip(section.subsection_slugs, section.subsection_titles_cased),
+                    start=1,
+                ):
+                    sub_num = _two_digit(sub_idx)
+                    block.append(
+                        "".join(
+                            (
+                                "\t- [[",
+                                sub_num,
+                                "-",
+                                sub_slug,
+                                "|",
+                                short_title,
+                                " - ",
+                                sec_num,
+                                ".",
+                                sub_num,
+                                " - ",
+                                sub_title,
+                                "]]\n",
+                            )
+                        )
+                    )
+                block.append(
+                    "".join(
+                        (
+                            "\t- [[",
+                            flashcards_num,
+                            "-flashcards_",
+                            section.slug,
+                            "|",
+                            short_title,
+                            " - ",
+                            sec_num,
+                            ".",
+                            flashcards_num,
+                            " - ",
+                            section.title_cased,
+                            " Flashcards]]\n",
+                        )
                     )
-
-                section_flashcard_file = (
-                    f"\t- [[{FLASHCARDS_PAGE}-flashcards_{sec_slug}|"
-                    f"{self.short_title} - {sec_num}.{FLASHCARDS_PAGE} "
-                    f"- {handle_title(section.section_title)} Flashcards]]\n"
                 )
-                lines.append(section_flashcard_file)
+                self.toc_subsection_blocks.append("".join(block).encode("utf-8"))
             else:
                 lines.append(
-                    f"- [[{sec_idx:02d}-{sec_slug}|"
-                    f"{self.short_title} - {sec_idx:02d} "
-                    f"- {handle_title(section.section_title)}]]\n"
+                    "".join(
+                        (
+                            "- [[",
+                            sec_num,
+                            "-",
+                            section.slug,
+                            "|",
+                            short_title,
+                            " - ",
+                            sec_num,
+                            " - ",
+                            section.title_cased,
+                            "]]\n",
+                        )
+                    )
                 )
+                self.toc_subsection_blocks.append(b"")
 
-        table_of_contents = "".join(lines)
-
-        return render_markdown(title, table_of_contents, dates=False)
+        encoded_lines = [line.encode("utf-8") for line in lines]
+        self.toc_listing = b"".join(encoded_lines)
+        self.toc_line_ends = list(accumulate(map(len, encoded_lines)))
 
     @property
     def output_dir(self) -> str:
+        """
+        The output directory for the course, resolved once by `generate_course()` after the `slug` is set, rather than calling `os.getcwd()` for every file. Before that, it is resolved afresh on each access.
+
+        Returns:
+            str: The directory path for the course, optionally prepended with `course_number`.
+        """
+        return self._output_dir or self.resolve_output_dir()
+
+    def resolve_output_dir(self) -> str:
         """
         Generates the output directory for the course using the `slug` - optionally combined with the `course_number`, if provided.
 
@@ -435,7 +751,7 @@ class Course:
         """
         if self.course_number:
             return os.path.join(
-                os.getcwd(), f"{int(self.course_number):02d}-{self.slug}"
+                os.getcwd(), f"{_two_digit(int(self.course_number))}-{self.slug}"
             )
         return os.path.join(os.getcwd(), self.slug)
 
@@ -445,6 +761,8 @@ class Course:
         write_dirs: bool,
         extra_section: str,
         no_toc: bool,
+        pending: list[tuple[str, tuple[bytes | memoryview, ...]]] | None = None,
+        created_dirs: set[str] | None = None,
     ) -> None:
         """
         Iterates of the course `sections`, calling `generate_dir_and_markdown_files` for each `section` to create all directories and files.
@@ -452,19 +770,44 @@ class Course:
         Args:
             sections (list[Section]):
                 The list of `Section` objects within the `Course`.
+            pending (list[tuple[str, tuple[bytes | memoryview, ...]]] | None):
+                If supplied, the files are queued here for `FileGenerator.write_files()` rather than written immediately.
+            created_dirs (set[str] | None):
+                The directories already created during this run, shared with `_ensure_dir()`.
         """
         for index, section in enumerate(sections, start=1):
             section.generate_dir_and_markdown_files(
-                index, self, write_dirs, extra_section, no_toc
+                index, self, write_dirs, extra_section, no_toc, pending, created_dirs
             )
 
     def generate_course(self, write_dirs: bool, extra_section, no_toc: bool) -> None:
         """
-        Sets up course fields for `slug` and `course_template`, then calls `generate_sections()` to create the files.
+        Sets up course fields for `slug` and `course_template`, queues the course index file once, then calls `generate_sections()` to build the section files and writes them all in a single pass.
         """
-        self.slug: str = generate_slug(self.course_title)
-        self.course_template: str = self.generate_course_template(write_dirs)
-        self.generate_sections(self.sections, write_dirs, extra_section, no_toc)
+        # interned, as these are embedded in every table of contents and page title
+        self.slug: str = sys.intern(generate_slug(self.course_title))
+        self.short_title = sys.intern(self.short_title)
+        self._output_dir = self.resolve_output_dir()
+        self.precompute_toc_lines(write_dirs)
+        self.course_template: tuple[bytes, ...] = self.generate_course_template()
+
+        pending: list[tuple[str, tuple[bytes | memoryview, ...]]] = []
+        # directories created during this run only, as an earlier run's may have been removed since
+        created_dirs: set[str] = set()
+
+        # the course index is the same for every section, so it is queued once here
+        course_index_file: MarkdownPage = MarkdownPage(
+            self.course_title,
+            self.slug,
+            self.course_template,
+            f"{_two_digit(INDEX_PAGE)}-{self.slug}.md",
+        )
+        FileGenerator.create_markdown_file(course_index_file, self.output_dir, pending)
+
+        self.generate_sections(
+            self.sections, write_dirs, extra_section, no_toc, pending, created_dirs
+        )
+        FileGenerator.write_files(pending, created_dirs)
 
 
 def get_user_input(write_dirs: bool) -> Course:
@@ -513,6 +856,132 @@ def get_user_input(write_dirs: bool) -> Course:
     return course
 
 
+def parse_file(path: str, write_dirs: bool) -> Course:
+    """
+    Reads the course from a text file in a single pass, rather than querying the user line-by-line.
+
+    - The first three lines are the `course_number` (leave the line blank if no course number), the `course_title`, and the `short_title`.
+    - Each following un-indented line is a `section_title`, and each indented line below it is a `subsection_title` of that `section` (ignored unless `write_dirs`). Blank lines are skipped.
+
+    Args:
+        path (str): The path of the text file to read.
+        write_dirs (bool): If the subsections should be read.
+
+    Returns:
+        Course: A `Course` instance created from the file contents.
+
+    Raises:
+        ValueError: If the course number, course title, or section structure is invalid.
+    """
+    with open(path, encoding="utf-8-sig") as file:
+        lines = file.read().splitlines()
+
+    if len(lines) < 3:
+        raise ValueError(
+            f"{path} must start with the course number, course title, and short-form title lines."
+        )
+
+    course_number, course_title, short_title = (line.strip() for line in lines[:3])
+    try:
+        course_number = int(course_number) if course_number else None
+    except ValueError:
+        raise ValueError(
+            f"Invalid course number in {path}: {course_number!r}."
+        ) from None
+
+    if not course_title:
+        raise ValueError(f"Course title cannot be empty in {path}.")
+
+    course = Course(course_title, short_title, course_number)
+
+    section = None
+    for line in lines[3:]:
+        title = line.strip()
+        if not title:
+            continue
+
+        if line[0].isspace():
+            if section is None:
+                raise ValueError(
+                    f"Subsection {title!r} in {path} is not under a section."
+                )
+            if write_dirs:
+                section.add_subsections(title)
+        else:
+            section = Section(title, course)
+            course.sections.append(section)
+
+    return course
+
+
+def parse_spec(path: str, write_dirs: bool) -> Course:
+    """
+    Reads the course from a JSON spec in a single pass, rather than querying the user line-by-line.
+
+    The spec is an object with a `course_title`, and optionally a `short_title`, a `course_number`, and a list of `sections` - each an object with a `title` and an optional list of `subsections` titles (ignored unless `write_dirs`), e.g. `{"course_title": "example course", "short_title": "EC 1", "sections": [{"title": "Section 1", "subsections": ["Subsection 1-1"]}]}`.
+
+    Args:
+        path (str): The path of the JSON spec to read.
+        write_dirs (bool): If the subsections should be read.
+
+    Returns:
+        Course: A `Course` instance created from the spec.
+
+    Raises:
+        ValueError: If the spec is not valid JSON, or the course number, titles, sections, or subsections are missing or of the wrong type.
+    """
+    with open(path, encoding="utf-8-sig") as file:
+        try:
+            spec = json.load(file)
+        except json.JSONDecodeError as err:
+            raise ValueError(f"Invalid JSON in {path}: {err}.") from None
+
+    if not isinstance(spec, dict):
+        raise ValueError(f"{path} must contain a JSON object.")
+
+    course_number = spec.get("course_number")
+    if course_number is not None and (
+        isinstance(course_number, bool) or not isinstance(course_number, int)
+    ):
+        raise ValueError(f"Invalid course number in {path}: {course_number!r}.")
+
+    course_title = spec.get("course_title")
+    if not isinstance(course_title, str) or not course_title.strip():
+        raise ValueError(f"Course title cannot be empty in {path}: {course_title!r}.")
+
+    short_title = spec.get("short_title", "")
+    if not isinstance(short_title, str):
+        raise ValueError(f"Invalid short-form title in {path}: {short_title!r}.")
+
+    sections = spec.get("sections", [])
+    if not isinstance(sections, list):
+        raise ValueError(f"The sections in {path} must be a list: {sections!r}.")
+
+    course = Course(course_title.strip(), short_title.strip(), course_number)
+
+    for section_spec in sections:
+        if not isinstance(section_spec, dict) or not isinstance(
+            section_spec.get("title"), str
+        ):
+            raise ValueError(f"Each section in {path} needs a title: {section_spec!r}.")
+
+        subsections = section_spec.get("subsections", [])
+        if not isinstance(subsections, list) or not all(
+            isinstance(subsection_title, str) for subsection_title in subsections
+        ):
+            raise ValueError(
+                f"The subsections in {path} must be a list of titles: {subsections!r}."
+            )
+
+        section = Section(section_spec["title"].strip(), course)
+        if write_dirs:
+            for subsection_title in subsections:
+                section.add_subsections(subsection_title.strip())
+        course.sections.append(section)
+
+    return course
+
+
 def parse_args() -> argparse.Namespace:
     """
     Argparse handler to bundle up all the command-line arguments.
@@ -538,6 +1007,21 @@ def parse_args() -> argparse.Namespace:
         help="Pass in a string in markdown format to over-ride the additional formatting of the subsection files. When --no-dirs also flagged, this will over-ride the additional formatting of the section files. Note: best used with single quotes rather than double quotes to avoid any escaping issues present in the terminal.",
         type=str,
     )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "-f",
+        "--from-file",
+        help="Read the course from a text file rather than the interactive prompts. The first three lines are the course number (blank line if none), course title, and short-form title; each following line is a section title, with its subsection titles on the indented lines below it.",
+        metavar="PATH",
+        type=str,
+    )
+    source.add_argument(
+        "-s",
+        "--spec",
+        help='Read the course from a JSON spec rather than the interactive prompts, e.g. {"course_number": 1, "course_title": "example course", "short_title": "EC 1", "sections": [{"title": "Section 1", "subsections": ["Subsection 1-1"]}]}.',
+        metavar="PATH",
+        type=str,
+    )
 
     args = parser.parse_args()
 
@@ -556,9 +1040,14 @@ def parse_terminal_text(text: str | None) -> str | None:
     """
     if text is None:
         return None
-    return text.encode().decode("unicode_escape")
+    if "\\" not in text:
+        return text  # nothing to unescape
+    # `unicode_escape` reads its input as latin-1, so non-latin-1 characters
+    # are passed through as `\u` escapes rather than as mangled UTF-8 bytes
+    return text.encode("latin-1", "backslashreplace").decode("unicode_escape")
 
 
+@lru_cache(maxsize=None)
 def generate_slug(title: str) -> str:
     """
     Converts a title string into a filesystem friendly slug.
@@ -569,20 +1058,10 @@ def generate_slug(title: str) -> str:
     Returns:
       str: The slugified version of the input string.
     """
-    return (
-        title.replace("(", "")
-        .replace(")", "")
-        .replace(" ", "_")
-        .replace(":", "_-")
-        .replace("/", "-")
-        .replace("?", "")
-        .replace("!", "")
-        .replace(",", "")
-        .replace("'", "")
-        .lower()
-    )
+    return title.replace(":", "_-").translate(_SLUG_TABLE).lower()
 
 
+@lru_cache(maxsize=None)
 def handle_title(text: str) -> str:
     """
     Converts a string to title case, handling cases in which the string may contain Roman numerals, as well as ensuring words such as "and", "or", "the" are not capitalized unless they are the first word.
@@ -593,92 +1072,147 @@ def handle_title(text: str) -> str:
     Returns:
         str: The title-cased, Roman-numeral handled version of the input string.
     """
-    rom_regex = re.compile(
-        r"^((?=[MDCLXVI])M*(C[MD]|D?C{0,3})(X[CL]|L?X{0,3})(I[XV]|V?I{0,3}))$",
-        re.IGNORECASE,
-    )
-
-    lower_case_words = {
-        "a",
-        "an",
-        "the",
-        "and",
-        "but",
-        "or",
-        "nor",
-        "for",
-        "so",
-        "yet",
-        "as",
-        "at",
-        "by",
-        "down",
-        "from",
-        "in",
-        "into",
-        "like",
-        "near",
-        "of",
-        "off",
-        "on",
-        "onto",
-        "out",
-        "over",
-        "past",
-        "per",
-        "to",
-        "up",
-        "upon",
-        "with",
-        "via",
-        "vs",
-    }
+    words = text.split()
+
+    # fast paths: a single word, or single-spaced words with no Roman numerals or lower-case words
+    if len(words) == 1 and words[0] == text:
+        return text.upper() if _ROM_REGEX.match(text) else text.capitalize()
+    if (
+        " ".join(words) == text
+        and _LOWER_CASE_WORDS.isdisjoint(map(str.lower, words))
+        and not any(_ROM_REGEX.match(word) for word in words)
+    ):
+        return string.capwords(text)
 
-    parts = re.split(r"(\s+)", text)
     new_parts = []
-    for part in parts:
-        if rom_regex.match(part):
+    first_word = True
+    for part in _SPLIT_RE.split(text):
+        if not part or part.isspace():
+            new_parts.append(part)
+            continue
+
+        if _ROM_REGEX.match(part):
             new_parts.append(part.upper())
+        elif not first_word and part.lower() in _LOWER_CASE_WORDS:
+            new_parts.append(part.lower())
         else:
-            if part not in lower_case_words or part == parts[0]:
-                new_parts.append(part.capitalize())
-            else:
-                new_parts.append(part.lower())
+            new_parts.append(part.capitalize())
+        first_word = False
 
     return "".join(new_parts)
 
 
-def render_markdown(
-    title: str, table_of_contents: str, dates: bool = True, extra: str = "## Misc."
-) -> str:
+def _two_digit(number: int) -> str:
     """
-    Generate a markdown-file template, including YAML properties, and a table of contents.
+    Formats a page/section number as at least two digits, e.g. `1` becomes `01`, using the precomputed `_TWO_DIGIT` table for `0`-`99`.
+
+    Args:
+      number (int): The number to format.
+
+    Returns:
+      str: The zero-padded number.
+    """
+    if 0 <= number < 100:
+        return _TWO_DIGIT[number]
+    return f"{number:02d}"
+
+
+def _ensure_dir(path: str, created_dirs: set[str] | None = None) -> None:
+    """
+    Creates the directory `path` (and any missing parents), unless it is in `created_dirs`.
+
+    Once `path` exists so do all of its parents, so they are recorded too - e.g. creating a section's `100-review_files` directory means the section directory itself is never `mkdir`'d again.
+
+    Args:
+      path (str): The directory path to create.
+      created_dirs (set[str] | None): The directories already created during this run, updated in place; if `None`, the directory is always created.
+    """
+    if created_dirs is None:
+        os.makedirs(path, exist_ok=True)
+        return
+    if path in created_dirs:
+        return
+
+    os.makedirs(path, exist_ok=True)
+    path = os.path.normpath(path)
+    while path not in created_dirs:
+        created_dirs.add(path)
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+
+
+def _build_full_toc(course: Course) -> bytes:
+    """
+    Joins the TOC listing precomputed by `Course.precompute_toc_lines()` into a single table of contents, with the `subsections` of every `section` spliced in.
+
+    Args:
+      course (Course):
+        The `Course` whose TOC listing has been precomputed.
+
+    Returns:
+      bytes: The UTF-8 encoded markdown table of contents.
+    """
+    listing = memoryview(course.toc_listing)
+    ends = course.toc_line_ends
+    parts = [listing[: ends[0]]]
+    for start, end, subsection_block in zip(
+        ends, ends[1:], course.toc_subsection_blocks
+    ):
+        parts.append(listing[start:end])
+        parts.append(subsection_block)
+
+    return b"".join(parts)
+
+
+@lru_cache(maxsize=1024)
+def _render_tail(extra: str) -> bytes:
+    """
+    Encodes the end of a page - the closing rule and the `extra` markdown - caching the result so every page sharing the same `extra` references the same `bytes` object.
+
+    Args:
+      extra (str): The additional markdown at the end of the page.
+
+    Returns:
+      bytes: The UTF-8 encoded end of the page.
+    """
+    return _TPL_TAIL + extra.encode("utf-8")
+
+
+def render_page_chunks(
+    title: str,
+    toc_chunks: tuple[bytes | memoryview, ...],
+    dates: bool = True,
+    extra: str = "## Misc.",
+) -> tuple[bytes | memoryview, ...]:
+    """
+    Generate a markdown-file template around an already encoded table of contents, which is passed through by reference so that pages sharing a TOC never copy it.
 
     Args:
       title (str):
         The title to be used in the YAML properties and the H1 header.
-      table_of_contents (str):
-        The supplied table of contents to render.
+      toc_chunks (tuple[bytes | memoryview, ...]):
+        The UTF-8 encoded chunks of the table of contents, in order.
       dates (bool):
-        If the YAML properties should have a dates, adds a `dates` list to the YAML properties.
+        If the YAML properties should have a dates, adds a `dates` list to the YAML properties (otherwise the line is omitted entirely).
       extra (str):
         Additional markdown to add, defaults to `## Misc.`.
 
     Returns:
-      str: A markdown template.
-    """
-    return (
-        "---\n"
-        f'title: "{title}"\n'
-        "tags: []\n"
-        f"{'dates: []' if dates else ''}\n"
-        "---\n"
-        f"# {title}\n"
-        "## TOC\n"
-        f"{table_of_contents}\n"
-        "---\n"
-        f"{extra}"
+      tuple[bytes | memoryview, ...]: The page header (YAML properties and H1), followed by the `toc_chunks`, and the `extra` markdown.
+    """
+    encoded_title = title.encode("utf-8")
+    head = b"".join(
+        (
+            _TPL_YAML_OPEN,
+            encoded_title,
+            _TPL_YAML_DATES if dates else _TPL_YAML_NODATES,
+            encoded_title,
+            _TPL_TOC,
+        )
     )
+    return (head, *toc_chunks, _render_tail(extra))
 
 
 def main():
@@ -687,7 +1221,17 @@ def main():
     no_toc = args.no_toc
     extra_section = parse_terminal_text(args.extra)
 
-    course = get_user_input(write_dirs)
+    if args.from_file or args.spec:
+        try:
+            if args.from_file:
+                course = parse_file(args.from_file, write_dirs)
+            else:
+                course = parse_spec(args.spec, write_dirs)
+        except (ValueError, OSError) as err:
+            # report a bad or missing course file without a traceback
+            sys.exit(f"error: {err}")
+    else:
+        course = get_user_input(write_dirs)
     course.generate_course(write_dirs, extra_section, no_toc)
 
 
@@ -1,4 +1,7 @@
-from course_setup_md import handle_title, get_user_input, parse_args, parse_terminal_text, generate_slug, render_markdown, Course, Section
+from course_setup_md import FileGenerator, MarkdownPage, handle_title, get_user_input, parse_file, parse_spec, parse_args, parse_terminal_text, generate_slug, render_page_chunks, main, Course, Section
+import os
+import shutil
+import pytest
 
 
 # Test cases for handle_title function
@@ -13,6 +16,11 @@ def test_handle_title_lower_case_words():
   assert handle_title("title of the course") == "Title of the Course"
   assert handle_title("the course is important") == "The Course Is Important"
 
+def test_handle_title_lower_case_words_after_first():
+  assert handle_title("the art of the deal") == "The Art of the Deal"
+  assert handle_title("Title Of The Course") == "Title of the Course"
+  assert handle_title("  an intro to it") == "  An Intro to It"
+
 # Test cases for get_user_input function
 # function to mock inputs
 def mock_inputs(course_seq):
@@ -78,8 +86,335 @@ def test_get_user_input_course_number_invalid(monkeypatch):
   assert course.course_number == 1
 
 
+# Test cases for parse_file function
+def test_parse_file_with_dirs(tmp_path):
+  course_file = tmp_path / "course.txt"
+  course_file.write_text("1\nexample course\nEC 1\nSection 1\n  Subsection 1-1\n  Subsection 1-2\n\nSection 2\n\tSubsection 2-1\n")
+  course = parse_file(str(course_file), write_dirs=True)
+  assert isinstance(course, Course)
+  assert course.course_number == 1
+  assert course.course_title == "example course"
+  assert course.short_title == "EC 1"
+  assert [section.section_title for section in course.sections] == ["Section 1", "Section 2"]
+  assert course.sections[0].subsections == ["Subsection 1-1", "Subsection 1-2"]
+  assert course.sections[1].subsections == ["Subsection 2-1"]
+
+def test_parse_file_without_dirs(tmp_path):
+  course_file = tmp_path / "course.txt"
+  course_file.write_text("\nexample course\nEC 1\nSection 1\n  Subsection 1-1\nSection 2\n")
+  course = parse_file(str(course_file), write_dirs=False)
+  assert course.course_number is None
+  assert course.sections[1].section_title == "Section 2"
+  assert course.sections[0].subsections == []
+
+def test_parse_file_with_bom(tmp_path):
+  course_file = tmp_path / "course.txt"
+  course_file.write_text("1\nexample course\nEC 1\nSection 1\n", encoding="utf-8-sig")
+  course = parse_file(str(course_file), write_dirs=True)
+  assert course.course_number == 1
+
+def test_parse_file_invalid(tmp_path):
+  course_file = tmp_path / "course.txt"
+  course_file.write_text("a\nexample course\nEC 1\n")
+  with pytest.raises(ValueError):
+    parse_file(str(course_file), write_dirs=True)
+
+  course_file.write_text("1\nexample course\nEC 1\n  Subsection 1-1\n")
+  with pytest.raises(ValueError):
+    parse_file(str(course_file), write_dirs=True)
+
+def test_main_reports_invalid_file(tmp_path, monkeypatch):
+  course_file = tmp_path / "course.txt"
+  course_file.write_text("x\nexample course\nEC 1\n")
+  monkeypatch.setattr("sys.argv", ["course_setup_md.py", "-f", str(course_file)])
+  with pytest.raises(SystemExit, match="error: Invalid course number"):
+    main()
+
+  monkeypatch.setattr("sys.argv", ["course_setup_md.py", "-f", str(tmp_path / "missing.txt")])
+  with pytest.raises(SystemExit, match="error: .*missing.txt"):
+    main()
+
+  spec_file = tmp_path / "course.json"
+  spec_file.write_text('{"course_title": "example course", "sections": null}')
+  monkeypatch.setattr("sys.argv", ["course_setup_md.py", "-s", str(spec_file)])
+  with pytest.raises(SystemExit, match="error: The sections"):
+    main()
+
+# Test cases for parse_spec function
+def test_parse_spec_with_dirs(tmp_path):
+  spec_file = tmp_path / "course.json"
+  spec_file.write_text('{"course_number": 1, "course_title": "example course", "short_title": "EC 1", "sections": [{"title": "Section 1", "subsections": ["Subsection 1-1", "Subsection 1-2"]}, {"title": "Section 2"}]}')
+  course = parse_spec(str(spec_file), write_dirs=True)
+  assert course.course_number == 1
+  assert course.course_title == "example course"
+  assert course.short_title == "EC 1"
+  assert [section.section_title for section in course.sections] == ["Section 1", "Section 2"]
+  assert course.sections[0].subsections == ["Subsection 1-1", "Subsection 1-2"]
+  assert course.sections[1].subsections == []
+
+def test_parse_spec_without_dirs(tmp_path):
+  spec_file = tmp_path / "course.json"
+  spec_file.write_text('{"course_title": "example course", "sections": [{"title": "Section 1", "subsections": ["Subsection 1-1"]}]}')
+  course = parse_spec(str(spec_file), write_dirs=False)
+  assert course.course_number is None
+  assert course.short_title == ""
+  assert course.sections[0].subsections == []
+
+def test_parse_spec_with_bom(tmp_path):
+  spec_file = tmp_path / "course.json"
+  spec_file.write_text('{"course_title": "example course"}', encoding="utf-8-sig")
+  assert parse_spec(str(spec_file), write_dirs=True).course_title == "example course"
+
+def test_parse_spec_invalid(tmp_path):
+  spec_file = tmp_path / "course.json"
+  for contents in ('{"course_title": "example', '["example course"]', '{"course_number": "a", "course_title": "example course"}', '{"short_title": "EC 1"}', '{"course_title": "example course", "sections": ["Section 1"]}',
+                   '{"course_title": ["x"]}', '{"course_title": "example course", "short_title": 1}',
+                   '{"course_title": "example course", "sections": null}',
+                   '{"course_title": "example course", "sections": [{"title": "Section 1", "subsections": null}]}',
+                   '{"course_title": "example course", "sections": [{"title": "Section 1", "subsections": "abc"}]}',
+                   '{"course_title": "example course", "sections": [{"title": "Section 1", "subsections": [1]}]}'):
+    spec_file.write_text(contents)
+    with pytest.raises(ValueError):
+      parse_spec(str(spec_file), write_dirs=True)
+
+
+# Test cases for the table of contents
+def make_course():
+  course = Course("example course", "EC 1")
+  for section_title in ["section one", "section two"]:
+    section = Section(section_title, course)
+    section.add_subsections(f"intro to {section_title}")
+    course.sections.append(section)
+  course.slug = generate_slug(course.course_title)
+  return course
+
+def toc_text(chunks):
+  return b"".join(chunks).decode("utf-8")
+
+def test_generate_section_toc_with_dirs():
+  course = make_course()
+  course.precompute_toc_lines(write_dirs=True)
+  section = course.sections[1]
+  assert toc_text(section.generate_section_toc(course, 2, write_dirs=True, no_toc=False)) == (
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[00-section_one|EC 1 - 01.00 - Section One]]\n"
+    "- [[00-section_two|EC 1 - 02.00 - Section Two]]\n"
+    "\t- [[01-intro_to_section_two|EC 1 - 02.01 - Intro to Section Two]]\n"
+    "\t- [[99-flashcards_section_two|EC 1 - 02.99 - Section Two Flashcards]]\n"
+  )
+
+def test_generate_section_toc_without_dirs():
+  course = make_course()
+  course.precompute_toc_lines(write_dirs=False)
+  section = course.sections[0]
+  assert toc_text(section.generate_section_toc(course, 1, write_dirs=False, no_toc=False)) == (
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[01-section_one|EC 1 - 01 - Section One]]\n"
+    "- [[02-section_two|EC 1 - 02 - Section Two]]\n"
+  )
+  assert toc_text(section.generate_section_toc(course, 1, write_dirs=False, no_toc=True)) == (
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+  )
+
+def test_generate_section_toc_shares_listing():
+  course = make_course()
+  course.precompute_toc_lines(write_dirs=True)
+  first, second = course.sections
+  first_chunks = first.generate_section_toc(course, 1, write_dirs=True, no_toc=False)
+  second_chunks = second.generate_section_toc(course, 2, write_dirs=True, no_toc=False)
+  assert first_chunks[0].obj is course.toc_listing
+  assert second_chunks[0].obj is course.toc_listing
+
+def test_generate_section_toc_requires_index():
+  course = make_course()
+  course.precompute_toc_lines(write_dirs=True)
+  section = course.sections[0]
+  for index in (0, 3):
+    with pytest.raises(ValueError):
+      section.generate_section_toc(course, index, write_dirs=True, no_toc=False)
+
+
+# Test cases for FileGenerator
+def test_create_markdown_file(tmp_path):
+  page = MarkdownPage("Title", "title", (b"# T\xc3\xaftle\n", b"- toc\n"), "00-title.md")
+  out_dir = tmp_path / "course" / "01-section"
+  FileGenerator.create_markdown_file(page, str(out_dir))
+  assert (out_dir / "00-title.md").read_text(encoding="utf-8") == "# T\u00eftle\n- toc\n"
+
+  # overwrites, rather than appends to, an existing file
+  FileGenerator.create_markdown_file(MarkdownPage("Title", "title", (b"new",), "00-title.md"), str(out_dir))
+  assert (out_dir / "00-title.md").read_bytes() == b"new"
+
+  # recreates the directory if it was removed since the last write
+  shutil.rmtree(tmp_path / "course")
+  FileGenerator.create_markdown_file(page, str(out_dir))
+  assert (out_dir / "00-title.md").exists()
+
+def test_write_files_pending(tmp_path):
+  pending = []
+  for filename, out_dir in [("01-b.md", tmp_path / "b"), ("00-a.md", tmp_path), ("01-a.md", tmp_path / "b")]:
+    page = MarkdownPage(filename, filename, (filename.encode(), b"\n"), filename)
+    FileGenerator.create_markdown_file(page, str(out_dir), pending)
+  assert not (tmp_path / "00-a.md").exists()
+
+  FileGenerator.write_files(pending)
+  assert (tmp_path / "00-a.md").read_bytes() == b"00-a.md\n"
+  assert (tmp_path / "b" / "01-a.md").read_bytes() == b"01-a.md\n"
+  assert (tmp_path / "b" / "01-b.md").read_bytes() == b"01-b.md\n"
+
+# end-to-end: section pages are written from views into the course TOC listing
+def make_unicode_course():
+  course = Course("example course", "EC 1")
+  for section_title, subsections in [("café intro", ["first steps", "naïve ideas"]), ("section two", ["more"])]:
+    section = Section(section_title, course)
+    for subsection_title in subsections:
+      section.add_subsections(subsection_title)
+    course.sections.append(section)
+  return course
+
+def list_tree(root):
+  return sorted(str(path.relative_to(root)) for path in root.rglob("*"))
+
+def test_generate_course_with_dirs(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  make_unicode_course().generate_course(write_dirs=True, extra_section=None, no_toc=False)
+  out_dir = tmp_path / "example_course"
+  assert list_tree(out_dir) == [
+    "00-example_course.md",
+    "01-café_intro",
+    "01-café_intro/00-café_intro.md",
+    "01-café_intro/01-first_steps.md",
+    "01-café_intro/02-naïve_ideas.md",
+    "01-café_intro/100-review_files",
+    "01-café_intro/100-review_files/01-first_steps",
+    "01-café_intro/100-review_files/02-naïve_ideas",
+    "01-café_intro/99-flashcards_café_intro.md",
+    "02-section_two",
+    "02-section_two/00-section_two.md",
+    "02-section_two/01-more.md",
+    "02-section_two/100-review_files",
+    "02-section_two/100-review_files/01-more",
+    "02-section_two/99-flashcards_section_two.md",
+  ]
+  assert (out_dir / "00-example_course.md").read_bytes() == (
+    '---\ntitle: "EC 1 - Example Course"\ntags: []\n---\n'
+    "# EC 1 - Example Course\n## TOC\n"
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[00-café_intro|EC 1 - 01.00 - Café Intro]]\n"
+    "\t- [[01-first_steps|EC 1 - 01.01 - First Steps]]\n"
+    "\t- [[02-naïve_ideas|EC 1 - 01.02 - Naïve Ideas]]\n"
+    "\t- [[99-flashcards_café_intro|EC 1 - 01.99 - Café Intro Flashcards]]\n"
+    "- [[00-section_two|EC 1 - 02.00 - Section Two]]\n"
+    "\t- [[01-more|EC 1 - 02.01 - More]]\n"
+    "\t- [[99-flashcards_section_two|EC 1 - 02.99 - Section Two Flashcards]]\n"
+    "\n---\n## Misc."
+  ).encode("utf-8")
+  # the split for section two falls after the multi-byte section one line
+  assert (out_dir / "02-section_two" / "00-section_two.md").read_bytes() == (
+    '---\ntitle: "EC 1 - 02.00 - Section Two"\ntags: []\ndates: []\n---\n'
+    "# EC 1 - 02.00 - Section Two\n## TOC\n"
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[00-café_intro|EC 1 - 01.00 - Café Intro]]\n"
+    "- [[00-section_two|EC 1 - 02.00 - Section Two]]\n"
+    "\t- [[01-more|EC 1 - 02.01 - More]]\n"
+    "\t- [[99-flashcards_section_two|EC 1 - 02.99 - Section Two Flashcards]]\n"
+    "\n---\n## Misc."
+  ).encode("utf-8")
+  assert (out_dir / "01-café_intro" / "02-naïve_ideas.md").read_bytes() == (
+    '---\ntitle: "EC 1 - 01.02 - Naïve Ideas"\ntags: []\ndates: []\n---\n'
+    "# EC 1 - 01.02 - Naïve Ideas\n## TOC\n"
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[00-café_intro|EC 1 - 01.00 - Café Intro]]\n"
+    "\t- [[01-first_steps|EC 1 - 01.01 - First Steps]]\n"
+    "\t- [[02-naïve_ideas|EC 1 - 01.02 - Naïve Ideas]]\n"
+    "\t- [[99-flashcards_café_intro|EC 1 - 01.99 - Café Intro Flashcards]]\n"
+    "- [[00-section_two|EC 1 - 02.00 - Section Two]]\n"
+    "\n---\n# Key Points/Concepts\n\n# Lecture\n\n# Misc."
+  ).encode("utf-8")
+
+def test_generate_course_without_dirs(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  make_unicode_course().generate_course(write_dirs=False, extra_section=None, no_toc=False)
+  out_dir = tmp_path / "example_course"
+  assert list_tree(out_dir) == ["00-example_course.md", "01-café_intro.md", "02-section_two.md", "100-review_files"]
+  assert (out_dir / "02-section_two.md").read_bytes() == (
+    '---\ntitle: "EC 1 - 02 - Section Two"\ntags: []\ndates: []\n---\n'
+    "# EC 1 - 02 - Section Two\n## TOC\n"
+    "- [[00-example_course|EC 1 - Example Course]]\n"
+    "- [[01-café_intro|EC 1 - 01 - Café Intro]]\n"
+    "- [[02-section_two|EC 1 - 02 - Section Two]]\n"
+    "\n---\n# Key Points/Concepts\n\n# Lecture\n\n# Misc."
+  ).encode("utf-8")
+
+def test_output_dir_read_before_generate_course(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  course = make_course()
+  course.slug = ""
+  assert course.output_dir == os.path.join(str(tmp_path), "")
+  course.generate_course(write_dirs=False, extra_section=None, no_toc=False)
+  assert course.output_dir == str(tmp_path / "example_course")
+  assert (tmp_path / "example_course" / "01-section_one.md").exists()
+
+def test_generate_course_again_after_adding_section(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  course = make_course()
+  course.generate_course(write_dirs=True, extra_section=None, no_toc=False)
+  course.sections[0].add_subsections("outro to section one")
+  course.sections.append(Section("section three", course))
+  course.generate_course(write_dirs=True, extra_section=None, no_toc=False)
+
+  section_dir = tmp_path / "example_course" / "01-section_one"
+  for page in ["00-section_one.md", "99-flashcards_section_one.md"]:
+    text = (section_dir / page).read_text(encoding="utf-8")
+    assert "[[00-section_three|EC 1 - 03.00 - Section Three]]" in text
+    assert "[[02-outro_to_section_one|EC 1 - 01.02 - Outro to Section One]]" in text
+  assert "## Outro to Section One" in (section_dir / "99-flashcards_section_one.md").read_text(encoding="utf-8")
+
+def test_generate_course_after_output_removed(tmp_path, monkeypatch):
+  monkeypatch.chdir(tmp_path)
+  make_course().generate_course(write_dirs=True, extra_section=None, no_toc=False)
+  shutil.rmtree(tmp_path / "example_course")
+
+  make_course().generate_course(write_dirs=True, extra_section=None, no_toc=False)
+  assert (tmp_path / "example_course" / "00-example_course.md").exists()
+  assert (tmp_path / "example_course" / "02-section_two" / "100-review_files" / "01-intro_to_section_two").is_dir()
+
 
 # parse args function test cases
 # parse_terminal_text function test cases
+def test_parse_terminal_text():
+  assert parse_terminal_text(None) is None
+  assert parse_terminal_text("## Notes") == "## Notes"
+  assert parse_terminal_text("## Transcript\\n\\n## Vocabulary") == "## Transcript\n\n## Vocabulary"
+  assert parse_terminal_text("## Café\\n## Notes") == "## Café\n## Notes"
+  assert parse_terminal_text("## π\\t€") == "## π\t€"
+
 # generate_slug function test cases
-# render_markdown function test cases
\ No newline at end of file
+def test_generate_slug():
+  assert generate_slug("Course Title") == "course_title"
+  assert generate_slug("Part II: Don't Panic (Again)!") == "part_ii_-_dont_panic_again"
+  assert generate_slug("Why/How, What?") == "why-how_what"
+
+def test_generate_slug_cached():
+  generate_slug("cached title")
+  hits = generate_slug.cache_info().hits
+  assert generate_slug("cached title") == "cached_title"
+  assert generate_slug.cache_info().hits == hits + 1
+
+# render_page_chunks function test cases
+def test_render_page_chunks():
+  assert b"".join(render_page_chunks("T - 01", (b"- toc\n",))) == (
+    b'---\ntitle: "T - 01"\ntags: []\ndates: []\n---\n# T - 01\n## TOC\n- toc\n\n---\n## Misc.'
+  )
+
+def test_render_page_chunks_no_dates():
+  assert b"".join(render_page_chunks("100% Done", (), dates=False, extra="# Extra")) == (
+    b'---\ntitle: "100% Done"\ntags: []\n---\n# 100% Done\n## TOC\n\n---\n# Extra'
+  )
+
+def test_render_page_chunks_pass_toc_through():
+  toc = (b"- [[00-example_course|EC 1 - Example Course]]\n", b"\t- [[01-intro|EC 1 - 01.01 - Intro]]\n")
+  chunks = render_page_chunks("EC 1 - 01.01 - One", toc)
+  assert chunks[1] is toc[0]
+  assert chunks[2] is toc[1]
+  assert len(chunks) == 4